@@ -14,14 +14,18 @@ from __future__ import annotations
 import argparse
 import bisect
 import difflib
+import functools
 import json
+import operator
+import os
 import re
 import sys
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Iterable, List, Sequence, Tuple
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
 
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
@@ -35,12 +39,21 @@ REPORT_MD = REPORT_DIR / "color-report.md"
 REPORT_PATCH = REPORT_DIR / "color-tokenization.patch"
 
 TARGET_SUFFIXES = (".module.css", ".tsx")
+# Below this many files, worker startup costs more than the scan itself.
+PARALLEL_SCAN_MIN_FILES = 64
+IGNORED_DIR_NAMES = {"build", "coverage", "dist", "node_modules"}
 EXCLUDED_FILES = {
     "ui/src/styles/globals.css",
     "ui/src/styles/animations.css",
 }
 
-SKIP_WORDS = {"transparent", "currentcolor", "inherit", "initial", "unset", "none"}
+SKIP_WORDS = frozenset(
+    {"transparent", "currentcolor", "inherit", "initial", "unset", "none"}
+)
+COLOR_FUNCTIONS = frozenset({"rgb", "rgba", "hsl", "hsla"})
+# Every color literal contains one of these; cheaper to test than the regex.
+COLOR_HINTS = ("#", "rgb", "hsl", "white", "black")
+COLOR_HINT_BYTES = tuple(hint.encode("ascii") for hint in COLOR_HINTS)
 
 HEX_PATTERN = r"#(?:[0-9a-fA-F]{8}|[0-9a-fA-F]{6}|[0-9a-fA-F]{4}|[0-9a-fA-F]{3})\b"
 FUNC_PATTERN = r"\b(?:rgba?|hsla?)\(\s*[^()]*\)"
@@ -51,23 +64,60 @@ COLOR_LITERAL_RE = re.compile(COLOR_PATTERN, re.IGNORECASE)
 PURE_COLOR_RE = re.compile(rf"^\s*{COLOR_PATTERN}\s*$", re.IGNORECASE)
 CSS_DECL_RE = re.compile(r"(?P<prop>(?:--)?[a-zA-Z0-9-]+)\s*:\s*(?P<value>[^;{{}}]+);")
 VAR_DECL_RE = re.compile(r"(?P<prop>--[a-zA-Z0-9-]+)\s*:\s*(?P<value>[^;{{}}]+);")
+ROOT_SELECTOR_RE = re.compile(r":root\b", re.MULTILINE)
+LIGHT_MODE_SELECTOR_RE = re.compile(r"body\.light-mode\b", re.MULTILINE)
 
-JSX_ATTR_RE = re.compile(
-    r"\b(?P<prop>fill|stroke|stopColor|color|backgroundColor|borderColor|outlineColor)"
-    r"\s*=\s*(?P<q>[\"'])(?P<value>[^\"']*)(?P=q)"
+JSX_ATTR_PATTERN = (
+    r"\b(?P<jsx_prop>fill|stroke|stopColor|color|backgroundColor|borderColor|outlineColor)"
+    r"\s*=\s*(?P<jsx_q>[\"'])(?P<jsx_value>[^\"']*)(?P=jsx_q)"
+)
+STYLE_PROP_PATTERN = (
+    r"\b(?P<style_prop>color|backgroundColor|borderColor|outlineColor|fill|stroke|boxShadow|"
+    r"textShadow|filter|caretColor)\s*:\s*"
+    r"(?P<style_q>[\"'])(?P<style_value>[^\"']*)(?P=style_q)"
+)
+CONST_OBJECT_START_PATTERN = (
+    r"\b(?:const|let|var)\s+(?P<dict_name>[A-Za-z_][A-Za-z0-9_]*)\b[^=;]*=\s*\{"
 )
-STYLE_PROP_RE = re.compile(
-    r"\b(?P<prop>color|backgroundColor|borderColor|outlineColor|fill|stroke|boxShadow|"
-    r"textShadow|filter|caretColor)\s*:\s*(?P<q>[\"'])(?P<value>[^\"']*)(?P=q)"
+# Separate passes on purpose: matches of one pattern may overlap matches of
+# another (e.g. `color: "color="#fff"`), and a single alternation would let
+# the first branch swallow the others' hits.
+JSX_ATTR_RE = re.compile(JSX_ATTR_PATTERN)
+STYLE_PROP_RE = re.compile(STYLE_PROP_PATTERN)
+CONST_OBJECT_START_RE = re.compile(CONST_OBJECT_START_PATTERN, re.MULTILINE)
+# String body up to and including the closing quote; backslash escapes any char.
+SINGLE_QUOTED_PATTERN = r"'[^'\\]*(?:\\[\s\S][^'\\]*)*'"
+DOUBLE_QUOTED_PATTERN = r'"[^"\\]*(?:\\[\s\S][^"\\]*)*"'
+TEMPLATE_PATTERN = r"`[^`\\]*(?:\\[\s\S][^`\\]*)*`"
+COMMENT_PATTERN = r"//[^\n]*\n|/\*[\s\S]*?\*/"
+# Token tables for the brace/string scanners: whole comments and strings are
+# consumed as one token, and `bad` only matches where one is unterminated.
+BRACE_SCAN_RE = re.compile(
+    r"(?P<open>\{)|(?P<close>\})"
+    rf"|(?P<skip>{COMMENT_PATTERN}|{SINGLE_QUOTED_PATTERN}"
+    rf"|{DOUBLE_QUOTED_PATTERN}|{TEMPLATE_PATTERN})"
+    r"|(?P<bad>['\"`]|/[/*])"
 )
-CONST_OBJECT_START_RE = re.compile(
-    r"\b(?:const|let|var)\s+(?P<name>[A-Za-z_][A-Za-z0-9_]*)\b[^=;]*=\s*\{",
-    re.MULTILINE,
+QUOTED_VALUE_SCAN_RE = re.compile(
+    rf"(?P<value>{SINGLE_QUOTED_PATTERN}|{DOUBLE_QUOTED_PATTERN})"
+    rf"|(?P<skip>{COMMENT_PATTERN}|{TEMPLATE_PATTERN})"
+    r"|(?P<bad>['\"`]|/[/*])"
 )
 DICT_NAME_RE = re.compile(r"(?:color|colors|palette|theme)", re.IGNORECASE)
 
+# Bound methods for the per-file / per-segment hot loops.
+COLOR_FINDITER = COLOR_LITERAL_RE.finditer
+COLOR_FULLMATCH = COLOR_LITERAL_RE.fullmatch
+CSS_DECL_FINDITER = CSS_DECL_RE.finditer
+JSX_ATTR_FINDITER = JSX_ATTR_RE.finditer
+STYLE_PROP_FINDITER = STYLE_PROP_RE.finditer
+CONST_OBJECT_START_FINDITER = CONST_OBJECT_START_RE.finditer
+BRACE_SCAN_FINDITER = BRACE_SCAN_RE.finditer
+QUOTED_VALUE_SCAN_FINDITER = QUOTED_VALUE_SCAN_RE.finditer
+DICT_NAME_SEARCH = DICT_NAME_RE.search
 
-@dataclass
+
+@dataclass(slots=True)
 class Occurrence:
     rel_path: str
     start: int
@@ -79,6 +129,11 @@ class Occurrence:
     column: int = 0
 
 
+# attrgetter builds sort keys in C instead of calling a lambda per item.
+SPAN_KEY = operator.attrgetter("start", "end")
+REPORT_ORDER_KEY = operator.attrgetter("rel_path", "line", "column", "start")
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Tokenize hardcoded colors in CSS modules + TSX."
@@ -100,6 +155,12 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Alias of --apply (kept for compatibility).",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for the file scan (default: CPU count, 1 disables).",
+    )
     return parser.parse_args()
 
 
@@ -117,132 +178,64 @@ def ensure_parent(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
 
-def discover_target_files(root: Path) -> List[Path]:
-    stack: List[Path] = [root]
-    result: List[Path] = []
+def iter_files(root: str, suffixes: Tuple[str, ...]) -> Iterator[os.DirEntry]:
+    # DirEntry type checks reuse the d_type from the directory read, so the
+    # walk costs no extra stat per entry. With follow_symlinks=False a symlink
+    # is neither a dir nor a file, so links are skipped without a separate
+    # is_symlink() call, and ignored subtrees are pruned before descending.
+    stack: List[str] = [root]
     while stack:
         current = stack.pop()
         try:
-            entries = sorted(current.iterdir(), key=lambda p: p.name, reverse=True)
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        name = entry.name
+                        if name not in IGNORED_DIR_NAMES and not name.startswith("."):
+                            stack.append(entry.path)
+                    elif entry.name.endswith(suffixes) and entry.is_file(
+                        follow_symlinks=False
+                    ):
+                        yield entry
         except FileNotFoundError:
             continue
-        for entry in entries:
-            if entry.is_dir():
-                stack.append(entry)
-                continue
-            if not entry.name.endswith(TARGET_SUFFIXES):
-                continue
-            rel_path = entry.relative_to(REPO_ROOT).as_posix()
-            if rel_path in EXCLUDED_FILES:
-                continue
-            result.append(entry)
-    return sorted(result, key=lambda p: p.relative_to(REPO_ROOT).as_posix())
+
+
+def discover_target_files(root: Path) -> List[Tuple[Path, str]]:
+    prefix_len = len(str(REPO_ROOT)) + 1
+    result: List[Tuple[Path, str]] = []
+    # One tuple endswith() per name is already a single C call; filtering
+    # inside the walk also skips the is_file() check for every non-target.
+    for entry in iter_files(str(root), TARGET_SUFFIXES):
+        rel_path = entry.path[prefix_len:].replace(os.sep, "/")
+        if rel_path in EXCLUDED_FILES:
+            continue
+        result.append((Path(entry.path), rel_path))
+    result.sort(key=lambda item: item[1])
+    return result
 
 
 def find_matching_brace(text: str, open_index: int) -> int:
     if open_index < 0 or open_index >= len(text) or text[open_index] != "{":
         return -1
     depth = 0
-    i = open_index
-    in_single = False
-    in_double = False
-    in_backtick = False
-    in_line_comment = False
-    in_block_comment = False
-
-    while i < len(text):
-        ch = text[i]
-        nxt = text[i + 1] if i + 1 < len(text) else ""
-
-        if in_line_comment:
-            if ch == "\n":
-                in_line_comment = False
-            i += 1
-            continue
-
-        if in_block_comment:
-            if ch == "*" and nxt == "/":
-                in_block_comment = False
-                i += 2
-                continue
-            i += 1
-            continue
-
-        if in_single:
-            if ch == "\\" and nxt:
-                i += 2
-                continue
-            if ch == "'":
-                in_single = False
-            i += 1
-            continue
-
-        if in_double:
-            if ch == "\\" and nxt:
-                i += 2
-                continue
-            if ch == '"':
-                in_double = False
-            i += 1
-            continue
-
-        if in_backtick:
-            if ch == "\\" and nxt:
-                i += 2
-                continue
-            if ch == "`":
-                in_backtick = False
-            i += 1
-            continue
-
-        if ch == "/" and nxt == "/":
-            in_line_comment = True
-            i += 2
-            continue
-        if ch == "/" and nxt == "*":
-            in_block_comment = True
-            i += 2
-            continue
-        if ch == "'":
-            in_single = True
-            i += 1
-            continue
-        if ch == '"':
-            in_double = True
-            i += 1
-            continue
-        if ch == "`":
-            in_backtick = True
-            i += 1
-            continue
-
-        if ch == "{":
+    for token in BRACE_SCAN_FINDITER(text, open_index):
+        kind = token.lastgroup
+        if kind == "open":
             depth += 1
-        elif ch == "}":
+        elif kind == "close":
             depth -= 1
             if depth == 0:
-                return i
-            if depth < 0:
-                return -1
-        i += 1
+                return token.start()
+        elif kind == "bad":
+            return -1
     return -1
 
 
-def extract_root_block(text: str) -> str:
-    root_match = re.search(r":root\b", text)
-    if not root_match:
-        return ""
-    brace_open = text.find("{", root_match.end())
-    if brace_open < 0:
-        return ""
-    brace_close = find_matching_brace(text, brace_open)
-    if brace_close < 0:
-        return ""
-    return text[brace_open + 1 : brace_close]
-
-
-def find_selector_block_span(text: str, selector_regex: str) -> Tuple[int, int] | None:
-    match = re.search(selector_regex, text, flags=re.MULTILINE)
+def find_selector_block_span(
+    text: str, selector_re: re.Pattern[str]
+) -> Tuple[int, int] | None:
+    match = selector_re.search(text)
     if not match:
         return None
     open_brace = text.find("{", match.end())
@@ -254,13 +247,33 @@ def find_selector_block_span(text: str, selector_regex: str) -> Tuple[int, int]
     return (open_brace, close_brace)
 
 
-def build_declared_var_name_set(variables_css_path: Path) -> set[str]:
-    if not variables_css_path.exists():
-        return set()
-    text = variables_css_path.read_text(encoding="utf-8")
-    return {match.group("prop").strip() for match in VAR_DECL_RE.finditer(text)}
+def has_color_hint(value: str) -> bool:
+    # "#" has no case, so hex colors pass without lowering a copy first.
+    if "#" in value:
+        return True
+    lowered = value.lower()
+    return any(hint in lowered for hint in COLOR_HINTS)
+
+
+def has_color_hint_bytes(data: bytes) -> bool:
+    if b"#" in data:
+        return True
+    lowered = data.lower()
+    return any(hint in lowered for hint in COLOR_HINT_BYTES)
+
 
+def decode_source(data: bytes) -> str:
+    # Same result as read_text(): UTF-8 with universal newline translation,
+    # minus the incremental decoder. Most sources are LF-only already.
+    text = data.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
 
+
+# The set of distinct literals is bounded by the palette in use, so an
+# unbounded cache never evicts and skips the LRU bookkeeping on each hit.
+@functools.lru_cache(maxsize=None)
 def normalize_color_literal(raw: str) -> str | None:
     literal = raw.strip().lower()
     if not literal or literal in SKIP_WORDS:
@@ -273,36 +286,47 @@ def normalize_color_literal(raw: str) -> str | None:
 
     if literal.startswith("#"):
         if len(literal) == 4:
-            return "#" + "".join(c * 2 for c in literal[1:])
+            _, r, g, b = literal
+            return f"#{r}{r}{g}{g}{b}{b}"
         if len(literal) == 5:
-            return "#" + "".join(c * 2 for c in literal[1:])
+            _, r, g, b, a = literal
+            return f"#{r}{r}{g}{g}{b}{b}{a}{a}"
         if len(literal) in (7, 9):
             return literal
         return None
 
-    fn_match = re.fullmatch(r"(rgba?|hsla?)\((.*)\)", literal, flags=re.IGNORECASE)
-    if fn_match:
-        fn = fn_match.group(1).lower()
-        inner = fn_match.group(2).strip()
-        inner = re.sub(r"\s+", " ", inner)
-        inner = re.sub(r"\s*,\s*", ", ", inner)
-        inner = re.sub(r"\s*/\s*", " / ", inner)
-        return f"{fn}({inner})"
-
-    return None
-
-
-def build_existing_token_index(variables_css_path: Path) -> Dict[str, str]:
-    if not variables_css_path.exists():
-        return {}
-    text = variables_css_path.read_text(encoding="utf-8")
-    root_block = extract_root_block(text)
+    paren = literal.find("(")
+    if paren < 0 or not literal.endswith(")"):
+        return None
+    fn = literal[:paren]
+    inner = literal[paren + 1 : -1]
+    if fn not in COLOR_FUNCTIONS or "\n" in inner:
+        return None
+    # After collapsing runs of whitespace, separators carry at most one
+    # space on each side, so plain replaces normalize them.
+    inner = " ".join(inner.split())
+    inner = inner.replace(" ,", ",").replace(", ", ",").replace(",", ", ")
+    inner = inner.replace(" /", "/").replace("/ ", "/").replace("/", " / ")
+    return f"{fn}({inner})"
+
+
+def parse_variables_css(text: str) -> Tuple[set[str], Dict[str, str]]:
+    root_span = find_selector_block_span(text, ROOT_SELECTOR_RE)
+    root_start, root_end = root_span if root_span else (-1, -1)
+    declared: set[str] = set()
     index: Dict[str, str] = {}
-    for match in VAR_DECL_RE.finditer(root_block):
+    # Declarations never span a brace, so one pass over the whole file can
+    # attribute each match to the :root block by offset alone.
+    for match in VAR_DECL_RE.finditer(text):
         token = match.group("prop").strip()
+        declared.add(token)
+        if not root_start < match.start() < root_end:
+            continue
         value = match.group("value").strip()
         if "var(--" in value:
             continue
+        if not has_color_hint(value):
+            continue
         if not PURE_COLOR_RE.match(value):
             continue
         literal_match = COLOR_LITERAL_RE.search(value)
@@ -313,218 +337,253 @@ def build_existing_token_index(variables_css_path: Path) -> Dict[str, str]:
             continue
         if normalized not in index:
             index[normalized] = token
-    return index
+    return declared, index
 
 
 def iter_quoted_string_value_spans(
     text: str, start: int, end: int
 ) -> Iterable[Tuple[int, int]]:
-    i = start
-    in_line_comment = False
-    in_block_comment = False
-    while i < end:
-        ch = text[i]
-        nxt = text[i + 1] if i + 1 < end else ""
-
-        if in_line_comment:
-            if ch == "\n":
-                in_line_comment = False
-            i += 1
-            continue
-
-        if in_block_comment:
-            if ch == "*" and nxt == "/":
-                in_block_comment = False
-                i += 2
-                continue
-            i += 1
-            continue
-
-        if ch == "/" and nxt == "/":
-            in_line_comment = True
-            i += 2
-            continue
-        if ch == "/" and nxt == "*":
-            in_block_comment = True
-            i += 2
-            continue
-
-        if ch in ("'", '"'):
-            quote = ch
-            value_start = i + 1
-            i += 1
-            while i < end:
-                c = text[i]
-                if c == "\\" and i + 1 < end:
-                    i += 2
-                    continue
-                if c == quote:
-                    yield (value_start, i)
-                    i += 1
-                    break
-                i += 1
-            continue
-
-        if ch == "`":
-            i += 1
-            while i < end:
-                c = text[i]
-                if c == "\\" and i + 1 < end:
-                    i += 2
-                    continue
-                if c == "`":
-                    i += 1
-                    break
-                i += 1
-            continue
-
-        i += 1
+    for token in QUOTED_VALUE_SCAN_FINDITER(text, start, end):
+        kind = token.lastgroup
+        if kind == "value":
+            yield (token.start() + 1, token.end() - 1)
+        elif kind == "bad":
+            return
 
 
 def annotate_occurrence_positions(text: str, occurrences: Sequence[Occurrence]) -> None:
-    newline_indices = [idx for idx, char in enumerate(text) if char == "\n"]
+    if not occurrences:
+        return
+    # Occurrences are sorted by start, so count newlines incrementally between
+    # consecutive starts. The line start only moves when newlines were
+    # crossed, so rfind is bounded too and the pass stays O(len(text)).
+    line = 1
+    line_start = 0
+    cursor = 0
     for occ in occurrences:
-        line = bisect.bisect_right(newline_indices, occ.start) + 1
-        line_start = newline_indices[line - 2] + 1 if line > 1 else 0
+        start = occ.start
+        crossed = text.count("\n", cursor, start)
+        if crossed:
+            line += crossed
+            line_start = text.rfind("\n", cursor, start) + 1
+        cursor = start
         occ.line = line
-        occ.column = occ.start - line_start + 1
+        occ.column = start - line_start + 1
+
+
+def build_occurrence(
+    rel_path: str, start: int, end: int, raw: str, context: str
+) -> Occurrence | None:
+    # normalize_color_literal already rejects SKIP_WORDS.
+    normalized = normalize_color_literal(raw)
+    if not normalized:
+        return None
+    # Paths and contexts repeat across many occurrences; share one object each.
+    return Occurrence(
+        rel_path=sys.intern(rel_path),
+        start=start,
+        end=end,
+        raw=raw,
+        normalized=normalized,
+        context=sys.intern(context),
+    )
 
 
 def extract_colors_from_segment(
+    out: List[Occurrence],
     text: str,
     segment_start: int,
     segment_end: int,
     rel_path: str,
     context: str,
-) -> List[Occurrence]:
+    check_var: bool = True,
+) -> None:
+    # Hits go straight into the caller's list; no temporary list per segment.
     segment = text[segment_start:segment_end]
-    if "var(--" in segment:
-        return []
-    hits: List[Occurrence] = []
-    for match in COLOR_LITERAL_RE.finditer(segment):
-        raw = match.group(0)
-        normalized = normalize_color_literal(raw)
-        if not normalized:
-            continue
-        if raw.strip().lower() in SKIP_WORDS:
-            continue
-        abs_start = segment_start + match.start()
-        abs_end = segment_start + match.end()
-        hits.append(
-            Occurrence(
-                rel_path=rel_path,
-                start=abs_start,
-                end=abs_end,
-                raw=raw,
-                normalized=normalized,
-                context=context,
-            )
+    if check_var and "var(--" in segment:
+        return
+    if not has_color_hint(segment):
+        return
+    append = out.append
+    for match in COLOR_FINDITER(segment):
+        occ = build_occurrence(
+            rel_path,
+            segment_start + match.start(),
+            segment_start + match.end(),
+            match.group(0),
+            context,
         )
-    return hits
+        if occ is not None:
+            append(occ)
 
 
 def extract_occurrences_css(text: str, rel_path: str) -> List[Occurrence]:
+    # Scan the whole file for color literals once, then attribute each hit to
+    # its declaration value by offset instead of rescanning every value.
+    color_hits = [(m.start(), m.end()) for m in COLOR_FINDITER(text)]
+    if not color_hits:
+        return []
+    hit_starts = [start for start, _ in color_hits]
+
     occurrences: List[Occurrence] = []
-    for match in CSS_DECL_RE.finditer(text):
-        prop = match.group("prop").strip()
-        value = match.group("value")
-        if "var(--" in value:
-            continue
+    for match in CSS_DECL_FINDITER(text):
         value_start = match.start("value")
         value_end = match.end("value")
-        occurrences.extend(
+        lo = bisect.bisect_left(hit_starts, value_start)
+        hi = bisect.bisect_left(hit_starts, value_end)
+        # A whole-file hit that crosses the value boundary may hide hits a
+        # value-only scan would see; rescan just that value in that case.
+        straddles = (lo > 0 and color_hits[lo - 1][1] > value_start) or (
+            hi > lo and color_hits[hi - 1][1] > value_end
+        )
+        if lo == hi and not straddles:
+            continue
+        if text.find("var(--", value_start, value_end) >= 0:
+            continue
+        context = f"css:{match.group('prop').strip()}"
+        if straddles:
             extract_colors_from_segment(
+                out=occurrences,
                 text=text,
                 segment_start=value_start,
                 segment_end=value_end,
                 rel_path=rel_path,
-                context=f"css:{prop}",
+                context=context,
+                check_var=False,
             )
-        )
+            continue
+        for start, end in color_hits[lo:hi]:
+            occ = build_occurrence(rel_path, start, end, text[start:end], context)
+            if occ is not None:
+                occurrences.append(occ)
     return occurrences
 
 
 def extract_occurrences_tsx(text: str, rel_path: str) -> List[Occurrence]:
     occurrences: List[Occurrence] = []
 
-    for match in JSX_ATTR_RE.finditer(text):
-        prop = match.group("prop")
-        occurrences.extend(
-            extract_colors_from_segment(
-                text=text,
-                segment_start=match.start("value"),
-                segment_end=match.end("value"),
-                rel_path=rel_path,
-                context=f"tsx-jsx-attr:{prop}",
-            )
+    for match in JSX_ATTR_FINDITER(text):
+        extract_colors_from_segment(
+            out=occurrences,
+            text=text,
+            segment_start=match.start("jsx_value"),
+            segment_end=match.end("jsx_value"),
+            rel_path=rel_path,
+            context=f"tsx-jsx-attr:{match.group('jsx_prop')}",
         )
 
-    for match in STYLE_PROP_RE.finditer(text):
-        prop = match.group("prop")
-        occurrences.extend(
-            extract_colors_from_segment(
-                text=text,
-                segment_start=match.start("value"),
-                segment_end=match.end("value"),
-                rel_path=rel_path,
-                context=f"tsx-style-prop:{prop}",
-            )
+    for match in STYLE_PROP_FINDITER(text):
+        extract_colors_from_segment(
+            out=occurrences,
+            text=text,
+            segment_start=match.start("style_value"),
+            segment_end=match.end("style_value"),
+            rel_path=rel_path,
+            context=f"tsx-style-prop:{match.group('style_prop')}",
         )
 
-    for match in CONST_OBJECT_START_RE.finditer(text):
-        const_name = match.group("name")
-        if not DICT_NAME_RE.search(const_name):
-            continue
-        open_brace = text.find("{", match.end() - 1)
-        if open_brace < 0:
+    for match in CONST_OBJECT_START_FINDITER(text):
+        const_name = match.group("dict_name")
+        if not DICT_NAME_SEARCH(const_name):
             continue
+        # The pattern ends on the opening brace itself.
+        open_brace = match.end() - 1
         close_brace = find_matching_brace(text, open_brace)
         if close_brace < 0:
             continue
+        context = f"tsx-color-dict:{const_name}"
         for value_start, value_end in iter_quoted_string_value_spans(
             text, open_brace + 1, close_brace
         ):
-            occurrences.extend(
-                extract_colors_from_segment(
-                    text=text,
-                    segment_start=value_start,
-                    segment_end=value_end,
-                    rel_path=rel_path,
-                    context=f"tsx-color-dict:{const_name}",
+            # Color dict values are usually a bare literal: emit it directly
+            # and only fall back to a segment scan for composite strings.
+            content = text[value_start:value_end]
+            literal = content.strip()
+            if COLOR_FULLMATCH(literal):
+                literal_start = value_start + len(content) - len(content.lstrip())
+                occ = build_occurrence(
+                    rel_path,
+                    literal_start,
+                    literal_start + len(literal),
+                    literal,
+                    context,
                 )
+                if occ is not None:
+                    occurrences.append(occ)
+                continue
+            extract_colors_from_segment(
+                out=occurrences,
+                text=text,
+                segment_start=value_start,
+                segment_end=value_end,
+                rel_path=rel_path,
+                context=context,
             )
 
     return occurrences
 
 
-def collect_occurrences_for_file(path: Path) -> Tuple[str, List[Occurrence]]:
-    text = path.read_text(encoding="utf-8")
-    rel_path = path.relative_to(REPO_ROOT).as_posix()
+def collect_occurrences_for_file(
+    path: Path, rel_path: str
+) -> Tuple[str, List[Occurrence]]:
+    raw = path.read_bytes()
+    if not has_color_hint_bytes(raw):
+        # Nothing to rewrite; skip the UTF-8 decode entirely.
+        return "", []
+    text = decode_source(raw)
 
     if path.name.endswith(".module.css"):
-        raw_occurrences = extract_occurrences_css(text, rel_path)
+        # Declaration values are disjoint and scanned in order, so CSS hits
+        # are already unique and sorted.
+        occurrences = extract_occurrences_css(text, rel_path)
     else:
-        raw_occurrences = extract_occurrences_tsx(text, rel_path)
-
-    dedup: Dict[Tuple[int, int], Occurrence] = {}
-    for occ in raw_occurrences:
-        key = (occ.start, occ.end)
-        if key not in dedup:
-            dedup[key] = occ
+        # TSX branches can report the same span twice; keep the first one.
+        # Spans are packed into one int so dedup needs no per-occurrence tuple.
+        stride = len(text) + 1
+        seen: set[int] = set()
+        occurrences = []
+        for occ in extract_occurrences_tsx(text, rel_path):
+            key = occ.start * stride + occ.end
+            if key in seen:
+                continue
+            seen.add(key)
+            occurrences.append(occ)
+        occurrences.sort(key=SPAN_KEY)
 
-    occurrences = sorted(dedup.values(), key=lambda o: (o.start, o.end))
     annotate_occurrence_positions(text, occurrences)
     return text, occurrences
 
 
+def scan_file(item: Tuple[str, str]) -> Tuple[str, str, List[Occurrence]]:
+    path, rel_path = item
+    text, occurrences = collect_occurrences_for_file(Path(path), rel_path)
+    # Only files with occurrences are rewritten; don't ship the rest back.
+    return rel_path, text if occurrences else "", occurrences
+
+
+def scan_targets(
+    targets: Sequence[Tuple[Path, str]], jobs: int
+) -> List[Tuple[str, str, List[Occurrence]]]:
+    items = [(str(path), rel_path) for path, rel_path in targets]
+    if jobs <= 1 or len(items) < PARALLEL_SCAN_MIN_FILES:
+        return [scan_file(item) for item in items]
+    # About four batches per worker keeps IPC low while still balancing load.
+    chunksize = max(1, len(items) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(scan_file, items, chunksize=chunksize))
+
+
+def order_colors_by_frequency(freq: Counter[str]) -> List[str]:
+    return [
+        color for color, _ in sorted(freq.items(), key=lambda kv: (-kv[1], kv[0]))
+    ]
+
+
 def assign_tokens(
-    occurrences: Sequence[Occurrence],
+    ordered_colors: Sequence[str],
     existing_index: Dict[str, str],
     declared_token_names: set[str],
-) -> Tuple[Dict[str, str], Dict[str, str], Counter[str], Dict[str, str]]:
-    freq: Counter[str] = Counter(o.normalized for o in occurrences)
-    ordered_colors = sorted(freq.keys(), key=lambda color: (-freq[color], color))
-
+) -> Tuple[Dict[str, str], Dict[str, str], Dict[str, str]]:
     color_to_token: Dict[str, str] = {}
     color_source: Dict[str, str] = {}
     generated: Dict[str, str] = {}
@@ -548,22 +607,30 @@ def assign_tokens(
         color_source[color] = "generated"
         generated[token] = color
 
-    return color_to_token, color_source, freq, generated
+    return color_to_token, color_source, generated
 
 
 def apply_replacements(text: str, replacements: Sequence[Tuple[int, int, str]]) -> str:
     if not replacements:
         return text
-    ordered = sorted(replacements, key=lambda item: (item[0], item[1]))
+    # Occurrences arrive sorted by span already; only sort when they are not.
+    ordered = replacements
+    if any(
+        (prev[0], prev[1]) > (cur[0], cur[1])
+        for prev, cur in zip(replacements, replacements[1:])
+    ):
+        ordered = sorted(replacements, key=lambda item: (item[0], item[1]))
     out: List[str] = []
+    append = out.append
     cursor = 0
     for start, end, repl in ordered:
         if start < cursor:
             continue
-        out.append(text[cursor:start])
-        out.append(repl)
+        if start > cursor:
+            append(text[cursor:start])
+        append(repl)
         cursor = end
-    out.append(text[cursor:])
+    append(text[cursor:])
     return "".join(out)
 
 
@@ -573,30 +640,97 @@ def rewrite_contents(
     color_to_token: Dict[str, str],
 ) -> Dict[str, Tuple[str, str]]:
     changed: Dict[str, Tuple[str, str]] = {}
+    # One replacement string per color, shared by every file that uses it.
+    var_refs = {color: f"var({token})" for color, token in color_to_token.items()}
     for rel_path, original_text in file_texts.items():
-        occurrences = file_occurrences[rel_path]
-        replacements: List[Tuple[int, int, str]] = []
-        for occ in occurrences:
-            token = color_to_token[occ.normalized]
-            replacements.append((occ.start, occ.end, f"var({token})"))
+        replacements = [
+            (occ.start, occ.end, var_refs[occ.normalized])
+            for occ in file_occurrences[rel_path]
+        ]
         rewritten = apply_replacements(original_text, replacements)
         if rewritten != original_text:
             changed[rel_path] = (original_text, rewritten)
     return changed
 
 
+def format_hunk_range(start: int, stop: int) -> str:
+    # Same range notation as difflib.unified_diff.
+    length = stop - start
+    if length == 1:
+        return str(start + 1)
+    if not length:
+        return f"{start},0"
+    return f"{start + 1},{length}"
+
+
+def aligned_unified_diff(
+    rel_path: str, before_lines: List[str], after_lines: List[str], context: int = 3
+) -> List[str]:
+    """
+    Unified diff for two texts with the same line count.
+
+    Token rewrites only edit inside lines, so changed lines pair up 1:1 and
+    hunks can be cut around them directly instead of running SequenceMatcher.
+    """
+    changed = [
+        idx
+        for idx, (old, new) in enumerate(zip(before_lines, after_lines))
+        if old != new
+    ]
+    if not changed:
+        return []
+
+    groups: List[Tuple[int, int]] = []
+    first = last = changed[0]
+    for idx in changed[1:]:
+        if idx - last - 1 > 2 * context:
+            groups.append((first, last))
+            first = idx
+        last = idx
+    groups.append((first, last))
+
+    out = [f"--- {rel_path}", f"+++ {rel_path}"]
+    total = len(before_lines)
+    for first, last in groups:
+        lo = max(0, first - context)
+        hi = min(total, last + 1 + context)
+        hunk_range = format_hunk_range(lo, hi)
+        out.append(f"@@ -{hunk_range} +{hunk_range} @@")
+        i = lo
+        while i < hi:
+            if before_lines[i] == after_lines[i]:
+                out.append(" " + before_lines[i])
+                i += 1
+                continue
+            j = i
+            while j < hi and before_lines[j] != after_lines[j]:
+                j += 1
+            out.extend("-" + line for line in before_lines[i:j])
+            out.extend("+" + line for line in after_lines[i:j])
+            i = j
+    return out
+
+
 def build_patch(changed_files: Dict[str, Tuple[str, str]]) -> str:
     lines: List[str] = []
     for rel_path in sorted(changed_files.keys()):
         before, after = changed_files[rel_path]
-        diff = difflib.unified_diff(
-            before.splitlines(),
-            after.splitlines(),
-            fromfile=rel_path,
-            tofile=rel_path,
-            lineterm="",
-        )
-        chunk = list(diff)
+        if before == after:
+            continue
+        before_lines = before.splitlines()
+        after_lines = after.splitlines()
+        if len(before_lines) == len(after_lines):
+            chunk = aligned_unified_diff(rel_path, before_lines, after_lines)
+        else:
+            chunk = list(
+                difflib.unified_diff(
+                    before_lines,
+                    after_lines,
+                    fromfile=rel_path,
+                    tofile=rel_path,
+                    lineterm="",
+                )
+            )
         if not chunk:
             continue
         lines.extend(chunk)
@@ -614,10 +748,12 @@ def append_tokens_to_variables_css(text: str, generated_tokens: Dict[str, str])
         (token, generated_tokens[token]) for token in sorted(generated_tokens.keys())
     ]
 
-    def append_block(current_text: str, selector_regex: str) -> str:
-        span = find_selector_block_span(current_text, selector_regex)
+    def append_block(current_text: str, selector_re: re.Pattern[str]) -> str:
+        span = find_selector_block_span(current_text, selector_re)
         if not span:
-            raise ValueError(f"missing selector block for regex: {selector_regex}")
+            raise ValueError(
+                f"missing selector block for regex: {selector_re.pattern}"
+            )
         open_brace, close_brace = span
         block_body = current_text[open_brace + 1 : close_brace]
         existing = {m.group("prop").strip() for m in VAR_DECL_RE.finditer(block_body)}
@@ -632,8 +768,8 @@ def append_tokens_to_variables_css(text: str, generated_tokens: Dict[str, str])
         return current_text[:close_brace] + insertion + current_text[close_brace:]
 
     out = text
-    out = append_block(out, r":root\b")
-    out = append_block(out, r"body\.light-mode\b")
+    out = append_block(out, ROOT_SELECTOR_RE)
+    out = append_block(out, LIGHT_MODE_SELECTOR_RE)
     return out
 
 
@@ -656,34 +792,32 @@ def build_json_report(
     color_to_token: Dict[str, str],
     color_source: Dict[str, str],
     freq: Counter[str],
+    ordered_colors: Sequence[str],
+    source_counts: Counter[str],
 ) -> Dict[str, object]:
-    mapping_rows = []
-    for normalized in sorted(freq.keys(), key=lambda c: (-freq[c], c)):
-        mapping_rows.append(
-            {
-                "normalized": normalized,
-                "token": color_to_token[normalized],
-                "source": color_source[normalized],
-                "occurrences": freq[normalized],
-            }
-        )
+    mapping_rows = [
+        {
+            "normalized": normalized,
+            "token": color_to_token[normalized],
+            "source": color_source[normalized],
+            "occurrences": freq[normalized],
+        }
+        for normalized in ordered_colors
+    ]
 
-    occurrence_rows = []
-    for occ in sorted(
-        occurrences, key=lambda o: (o.rel_path, o.line, o.column, o.start)
-    ):
-        occurrence_rows.append(
-            {
-                "file": occ.rel_path,
-                "line": occ.line,
-                "column": occ.column,
-                "raw": occ.raw,
-                "normalized": occ.normalized,
-                "context": occ.context,
-                "token": color_to_token[occ.normalized],
-                "source": color_source[occ.normalized],
-            }
-        )
+    occurrence_rows = [
+        {
+            "file": occ.rel_path,
+            "line": occ.line,
+            "column": occ.column,
+            "raw": occ.raw,
+            "normalized": occ.normalized,
+            "context": occ.context,
+            "token": color_to_token[occ.normalized],
+            "source": color_source[occ.normalized],
+        }
+        for occ in sorted(occurrences, key=REPORT_ORDER_KEY)
+    ]
 
     return {
         "meta": {
@@ -697,8 +831,8 @@ def build_json_report(
             "files_scanned": files_scanned,
             "matches": len(occurrences),
             "unique_colors": len(freq),
-            "reused_tokens": sum(1 for s in color_source.values() if s == "existing"),
-            "new_tokens": sum(1 for s in color_source.values() if s == "generated"),
+            "reused_tokens": source_counts["existing"],
+            "new_tokens": source_counts["generated"],
         },
         "mappings": mapping_rows,
         "occurrences": occurrence_rows,
@@ -712,6 +846,8 @@ def build_markdown_report(
     color_to_token: Dict[str, str],
     color_source: Dict[str, str],
     freq: Counter[str],
+    ordered_colors: Sequence[str],
+    source_counts: Counter[str],
 ) -> str:
     unique_files_with_matches = len({o.rel_path for o in occurrences})
     raw_variants: Dict[str, set[str]] = defaultdict(set)
@@ -729,8 +865,8 @@ def build_markdown_report(
         f"- Files with matches: `{unique_files_with_matches}`",
         f"- Total color matches: `{len(occurrences)}`",
         f"- Unique normalized colors: `{len(freq)}`",
-        f"- Reused existing tokens: `{sum(1 for s in color_source.values() if s == 'existing')}`",
-        f"- New generated tokens: `{sum(1 for s in color_source.values() if s == 'generated')}`",
+        f"- Reused existing tokens: `{source_counts['existing']}`",
+        f"- New generated tokens: `{source_counts['generated']}`",
         "",
         "## Top Colors",
         "",
@@ -738,7 +874,7 @@ def build_markdown_report(
         "|---|---:|---|---|",
     ]
 
-    for normalized in sorted(freq.keys(), key=lambda c: (-freq[c], c)):
+    for normalized in ordered_colors:
         lines.append(
             f"| `{normalized}` | {freq[normalized]} | "
             f"`var({color_to_token[normalized]})` | {color_source[normalized]} |"
@@ -768,7 +904,7 @@ def build_markdown_report(
             "|---|---|---|---|",
         ]
     )
-    for normalized in sorted(freq.keys(), key=lambda c: (-freq[c], c)):
+    for normalized in ordered_colors:
         sample = ", ".join(
             f"`{s}`" for s in sorted(raw_variants[normalized], key=str.lower)
         )
@@ -809,31 +945,34 @@ def main() -> int:
     file_occurrences: Dict[str, List[Occurrence]] = {}
     all_occurrences: List[Occurrence] = []
 
-    for path in targets:
-        rel_path = path.relative_to(REPO_ROOT).as_posix()
-        text, occurrences = collect_occurrences_for_file(path)
+    for rel_path, text, occurrences in scan_targets(targets, args.jobs):
+        # Files without occurrences can never change, so keep only the rest.
+        if not occurrences:
+            continue
         file_texts[rel_path] = text
         file_occurrences[rel_path] = occurrences
         all_occurrences.extend(occurrences)
 
-    existing_index = build_existing_token_index(VARIABLES_CSS)
-    declared_token_names = build_declared_var_name_set(VARIABLES_CSS)
-    color_to_token, color_source, freq, generated_tokens = assign_tokens(
-        all_occurrences,
+    # variables.css is read once and shared by the index, the append and the
+    # test-mode preview below.
+    variables_text = decode_source(VARIABLES_CSS.read_bytes())
+    declared_token_names, existing_index = parse_variables_css(variables_text)
+    freq: Counter[str] = Counter([o.normalized for o in all_occurrences])
+    ordered_colors = order_colors_by_frequency(freq)
+    color_to_token, color_source, generated_tokens = assign_tokens(
+        ordered_colors,
         existing_index,
         declared_token_names,
     )
     changed_files = rewrite_contents(file_texts, file_occurrences, color_to_token)
 
     variables_rel = VARIABLES_CSS.relative_to(REPO_ROOT).as_posix()
-    if generated_tokens:
-        variables_before = VARIABLES_CSS.read_text(encoding="utf-8")
-        variables_after = append_tokens_to_variables_css(
-            variables_before, generated_tokens
-        )
-        if variables_before != variables_after:
-            changed_files[variables_rel] = (variables_before, variables_after)
+    variables_after = append_tokens_to_variables_css(variables_text, generated_tokens)
+    if variables_text != variables_after:
+        changed_files[variables_rel] = (variables_text, variables_after)
 
+    # Both reports and the summary line share one pass over the sources.
+    source_counts: Counter[str] = Counter(color_source.values())
     report_payload = build_json_report(
         mode=mode,
         files_scanned=len(targets),
@@ -841,6 +980,8 @@ def main() -> int:
         color_to_token=color_to_token,
         color_source=color_source,
         freq=freq,
+        ordered_colors=ordered_colors,
+        source_counts=source_counts,
     )
     markdown_report = build_markdown_report(
         mode=mode,
@@ -849,6 +990,8 @@ def main() -> int:
         color_to_token=color_to_token,
         color_source=color_source,
         freq=freq,
+        ordered_colors=ordered_colors,
+        source_counts=source_counts,
     )
 
     write_json(REPORT_JSON, report_payload)
@@ -858,10 +1001,6 @@ def main() -> int:
         write_text(REPORT_PATCH, build_patch(changed_files))
 
     if mode == "test":
-        variables_before = VARIABLES_CSS.read_text(encoding="utf-8")
-        variables_after = append_tokens_to_variables_css(
-            variables_before, generated_tokens
-        )
         write_text(
             GENERATED_VARIABLES_CSS,
             build_generated_header(
@@ -877,8 +1016,8 @@ def main() -> int:
 
     print(
         f"[{mode}] scanned={len(targets)} matches={len(all_occurrences)} "
-        f"unique={len(freq)} reused={sum(1 for s in color_source.values() if s == 'existing')} "
-        f"new={sum(1 for s in color_source.values() if s == 'generated')}"
+        f"unique={len(freq)} reused={source_counts['existing']} "
+        f"new={source_counts['generated']}"
     )
     print(f"report_json={REPORT_JSON.relative_to(REPO_ROOT).as_posix()}")
     print(f"report_md={REPORT_MD.relative_to(REPO_ROOT).as_posix()}")
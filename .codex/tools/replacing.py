@@ -18,15 +18,36 @@ Examples:
 from __future__ import annotations
 
 import argparse
+import fnmatch
+import glob
 import json
+import os
 import re
 import sys
+import tempfile
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Sequence
+from typing import Callable, Iterable, List, Sequence, Tuple, Union
 
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
+# Most files are rejected by the bytes prefilter in tens of microseconds,
+# while starting a pool (fork, re-compiling every rule in init_worker) takes
+# tens of milliseconds, and several times that under spawn on macOS/Windows.
+# Workers only pay for themselves on roughly a thousand files or more.
+PARALLEL_MIN_FILES = 1024
+IDENTIFIER_CHARS = frozenset(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-"
+)
+# Path.glob() matches case-insensitively on Windows; mirror that.
+GLOB_FLAGS = re.IGNORECASE if os.name == "nt" else 0
 
 
 @dataclass
@@ -37,6 +58,18 @@ class Rule:
     ignore_case: bool = False
 
 
+Replacement = Union[str, Callable[[re.Match[str]], str]]
+# A plain str in the pattern slot marks a literal applied with str.replace.
+CompiledRule = Tuple[Union[re.Pattern[str], str], Replacement]
+
+# Set in each pool worker by init_worker; fused rules hold lambdas, so they
+# are rebuilt per process instead of being pickled.
+WORKER_RULES: List[CompiledRule] = []
+WORKER_PREFILTER: re.Pattern[bytes] | None = None
+WORKER_APPLY = False
+WORKER_STREAM = False
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Batch replacement tool (VS Code style, scriptable)."
@@ -76,6 +109,29 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--verbose", action="store_true", help="Print per-file change counts."
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help=(
+            "Worker processes for the file pass, used once at least "
+            f"{PARALLEL_MIN_FILES} files match (default: CPU count, 1 disables)."
+        ),
+    )
+    parser.add_argument(
+        "--walk-threads",
+        type=int,
+        default=1,
+        help="Concurrent directory reads during discovery; helps on network mounts.",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Rewrite files line by line to bound memory "
+            "(non-empty literal rules without line breaks only)."
+        ),
+    )
     return parser.parse_args()
 
 
@@ -125,58 +181,617 @@ def load_rules(args: argparse.Namespace) -> List[Rule]:
     return rules
 
 
-def compile_rule(rule: Rule, identifier_boundary: bool) -> re.Pattern[str]:
+def wrap_identifier_boundary(pattern: str) -> str:
+    return rf"(?<![A-Za-z0-9-]){pattern}(?![A-Za-z0-9-])"
+
+
+# Keyed on plain values, so a map reused within one process (a wrapper that
+# calls main() per target, say) compiles each find once. re's own cache only
+# holds 512 patterns and large maps cycle through it.
+@lru_cache(maxsize=4096)
+def compile_find(
+    find: str, regex: bool, ignore_case: bool, identifier_boundary: bool
+) -> re.Pattern[str]:
     flags = re.MULTILINE
-    if rule.ignore_case:
+    if ignore_case:
         flags |= re.IGNORECASE
 
-    if rule.regex:
-        pattern = rule.find
+    if regex:
+        pattern = find
     else:
-        escaped = re.escape(rule.find)
+        escaped = re.escape(find)
         if identifier_boundary:
-            pattern = rf"(?<![A-Za-z0-9-]){escaped}(?![A-Za-z0-9-])"
+            pattern = wrap_identifier_boundary(escaped)
         else:
             pattern = escaped
 
     return re.compile(pattern, flags=flags)
 
 
+def compile_rule(rule: Rule, identifier_boundary: bool) -> re.Pattern[str]:
+    return compile_find(rule.find, rule.regex, rule.ignore_case, identifier_boundary)
+
+
+def strings_overlap(a: str, b: str) -> bool:
+    # True when an occurrence of one string can share characters with an
+    # occurrence of the other: containment or a suffix/prefix overlap.
+    if a in b or b in a:
+        return True
+    return any(
+        a.endswith(b[:k]) or b.endswith(a[:k]) for k in range(1, min(len(a), len(b)))
+    )
+
+
+def expand_literal_replacement(rule: Rule) -> str:
+    # The text subn() substitutes for one match of a literal rule.
+    return re.compile(re.escape(rule.find)).sub(rule.replace, rule.find)
+
+
+def can_fuse(
+    earlier: Rule, earlier_expanded: str, later: Rule, identifier_boundary: bool
+) -> bool:
+    # Running `earlier` and then `later` equals one combined pass only when
+    # their matches can never overlap and `later` can never match text that
+    # `earlier` wrote. With identifier boundaries, the lookarounds of `later`
+    # may also see the replaced edge characters, so those must keep their class.
+    if strings_overlap(earlier.find, later.find):
+        return False
+    if strings_overlap(earlier_expanded, later.find):
+        return False
+    if identifier_boundary:
+        for old, new in (
+            (earlier.find[0], earlier_expanded[0]),
+            (earlier.find[-1], earlier_expanded[-1]),
+        ):
+            if (old in IDENTIFIER_CHARS) != (new in IDENTIFIER_CHARS):
+                return False
+    return True
+
+
+def group_fusable_rules(
+    rules: Sequence[Rule], identifier_boundary: bool
+) -> List[List[Tuple[Rule, str]]]:
+    # Consecutive case-sensitive literal rules that do not interact are
+    # grouped; everything else (regex, ignore-case, interacting literals)
+    # stays in a group of its own so rule order is preserved exactly.
+    groups: List[List[Tuple[Rule, str]]] = []
+    fusable_tail = False
+    for rule in rules:
+        fusable = bool(rule.find) and not rule.regex and not rule.ignore_case
+        if not fusable:
+            groups.append([(rule, rule.replace)])
+            fusable_tail = False
+            continue
+        expanded = expand_literal_replacement(rule)
+        if fusable_tail and all(
+            can_fuse(prev, prev_expanded, rule, identifier_boundary)
+            for prev, prev_expanded in groups[-1]
+        ):
+            groups[-1].append((rule, expanded))
+        else:
+            groups.append([(rule, expanded)])
+        fusable_tail = True
+    return groups
+
+
+def literal_trie_pattern(finds: Iterable[str]) -> str:
+    # Factor shared prefixes out of a literal alternation so the regex engine
+    # branches once per distinct next character instead of retrying every
+    # literal at each position. Callers pass prefix-free finds (fused finds
+    # never contain one another), so alternative order cannot matter.
+    trie: dict = {}
+    for find in finds:
+        node = trie
+        for char in find:
+            node = node.setdefault(char, {})
+
+    def emit(node: dict) -> str:
+        chain = []
+        while len(node) == 1:
+            char, node = next(iter(node.items()))
+            chain.append(char)
+        prefix = re.escape("".join(chain))
+        if not node:
+            return prefix
+        branches = "|".join(
+            re.escape(char) + emit(child) for char, child in sorted(node.items())
+        )
+        return f"{prefix}(?:{branches})"
+
+    return emit(trie)
+
+
+def translate_glob_segment(segment: str) -> str:
+    # fnmatch rules for a single path component; wildcards never cross "/".
+    out: List[str] = []
+    i = 0
+    n = len(segment)
+    while i < n:
+        ch = segment[i]
+        i += 1
+        if ch == "*":
+            if not out or out[-1] != "[^/]*":
+                out.append("[^/]*")
+        elif ch == "?":
+            out.append("[^/]")
+        elif ch == "[":
+            j = i
+            if j < n and segment[j] == "!":
+                j += 1
+            if j < n and segment[j] == "]":
+                j += 1
+            while j < n and segment[j] != "]":
+                j += 1
+            if j >= n:
+                out.append("\\[")
+                continue
+            # Let fnmatch build the character set (ranges, "!" negation,
+            # escaping); a negated set must still not match "/".
+            char_set = fnmatch.translate(segment[i - 1 : j + 1])[4:-3]
+            i = j + 1
+            if char_set == ".":
+                char_set = "[^/]"
+            elif char_set.startswith("[^]"):
+                char_set = "[^]/" + char_set[3:]
+            elif char_set.startswith("[^"):
+                char_set = "[^/" + char_set[2:]
+            out.append(char_set)
+        else:
+            out.append(re.escape(ch))
+    return "".join(out)
+
+
+def compile_glob(pattern: str) -> re.Pattern[str] | None:
+    # Same matching rules as Path.glob(): "**" spans zero or more directories
+    # and "*" matches dotfiles. Patterns the walker does not model (absolute,
+    # "."/".." or empty segments, trailing "**") return None and use glob().
+    parts = pattern.split("/")
+    if not pattern or pattern.startswith("/") or parts[-1] == "**":
+        return None
+    if any(part in ("", ".", "..") for part in parts):
+        return None
+    regex: List[str] = []
+    for idx, part in enumerate(parts):
+        if part == "**":
+            regex.append("(?:[^/]+/)*")
+            continue
+        regex.append(translate_glob_segment(part))
+        if idx < len(parts) - 1:
+            regex.append("/")
+    return re.compile("".join(regex) + r"\Z", GLOB_FLAGS)
+
+
+def glob_anchor(pattern: str) -> str:
+    # Leading literal directories of a wildcard pattern; the walk for it can
+    # start there instead of at the root.
+    anchor: List[str] = []
+    for part in pattern.split("/")[:-1]:
+        if part == "**" or glob.has_magic(part):
+            break
+        anchor.append(part)
+    return "/".join(anchor)
+
+
+def compile_prune_glob(excludes: Sequence[str]) -> re.Pattern[str] | None:
+    # An exclude of the form "<dirs>/**/*" covers every file below any
+    # directory matching "<dirs>", so the walk need not enter one at all.
+    suffix = "/**/*"
+    regexes = [
+        compile_glob(pattern[: -len(suffix)])
+        for pattern in excludes
+        if pattern.endswith(suffix) and len(pattern) > len(suffix)
+    ]
+    alternatives = [regex.pattern for regex in regexes if regex is not None]
+    if not alternatives:
+        return None
+    return re.compile("|".join(f"(?:{alt})" for alt in alternatives), GLOB_FLAGS)
+
+
+def scan_directory(
+    path: str, prefix: str, prune: re.Pattern[str] | None, pruned: List[str]
+) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]], List[str]]:
+    # One directory read: (root-relative posix path, resolved path) for its
+    # files, (path, prefix) for its subdirectories, and its symlinked dirs.
+    # DirEntry type checks reuse d_type from the read, so there is no
+    # per-entry stat. Symlinked directories are not descended; symlinked
+    # files are the only entries that need a realpath() to match resolve().
+    # Subdirectories matching `prune` are wholly excluded; they are recorded
+    # in `pruned` instead of being walked.
+    files: List[Tuple[str, str]] = []
+    subdirs: List[Tuple[str, str]] = []
+    linked: List[str] = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    rel = f"{prefix}{entry.name}"
+                    if prune is not None and prune.match(rel):
+                        pruned.append(entry.path)
+                    else:
+                        subdirs.append((entry.path, rel + "/"))
+                elif entry.is_file():
+                    full = entry.path
+                    if entry.is_symlink():
+                        full = os.path.realpath(full)
+                    files.append((f"{prefix}{entry.name}", full))
+                elif entry.is_dir():
+                    linked.append(entry.path)
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        pass
+    return files, subdirs, linked
+
+
+def walk_tree(
+    starts: Sequence[Tuple[str, str]],
+    prune: re.Pattern[str] | None,
+    pruned: List[str],
+    linked_dirs: List[str],
+    threads: int,
+) -> List[Tuple[str, str]]:
+    tree: List[Tuple[str, str]] = []
+    if threads <= 1:
+        stack = list(starts)
+        while stack:
+            files, subdirs, linked = scan_directory(*stack.pop(), prune, pruned)
+            tree.extend(files)
+            linked_dirs.extend(linked)
+            stack.extend(subdirs)
+        return tree
+    # scandir releases the GIL, so a thread pool keeps several directory
+    # reads in flight; that pays off on network and overlay mounts, while on
+    # a local disk the per-directory handoff costs more than it saves.
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        pending = {
+            executor.submit(scan_directory, *start, prune, pruned)
+            for start in starts
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs, linked = future.result()
+                tree.extend(files)
+                linked_dirs.extend(linked)
+                pending.update(
+                    executor.submit(scan_directory, *subdir, prune, pruned)
+                    for subdir in subdirs
+                )
+    return tree
+
+
+def walk_anchors(
+    base: str,
+    anchors: Iterable[str],
+    prune: re.Pattern[str] | None,
+    pruned: List[str],
+    linked_dirs: List[str],
+    threads: int,
+) -> List[Tuple[str, str]]:
+    starts: List[Tuple[str, str]] = []
+    walked: List[str] = []
+    # Shortest first, so an anchor inside an already-walked one is skipped.
+    for anchor in sorted(set(anchors), key=len):
+        if any(
+            not done or anchor == done or anchor.startswith(done + "/")
+            for done in walked
+        ):
+            continue
+        walked.append(anchor)
+        if not anchor:
+            starts.append((base, ""))
+            continue
+        start = os.path.normpath(os.path.join(base, anchor))
+        if os.path.realpath(start) != start:
+            # The anchor itself goes through a symlink.
+            linked_dirs.append(start)
+            continue
+        starts.append((start, anchor + "/"))
+    return walk_tree(starts, prune, pruned, linked_dirs, threads) if starts else []
+
+
+def match_globs(
+    root: Path,
+    base: str,
+    patterns: Sequence[str],
+    tree: Sequence[Tuple[str, str]],
+    use_tree: bool,
+) -> set[str]:
+    found: set[str] = set()
+    regexes: List[re.Pattern[str]] = []
+    for pattern in patterns:
+        glob_re = compile_glob(pattern)
+        if glob_re is not None and not glob.has_magic(pattern):
+            # A literal path needs one stat, not a directory walk.
+            full = os.path.join(base, pattern)
+            if os.path.isfile(full):
+                found.add(os.path.realpath(full))
+        elif glob_re is None or not use_tree:
+            found.update(str(p.resolve()) for p in root.glob(pattern) if p.is_file())
+        else:
+            regexes.append(glob_re)
+    if regexes:
+        found.update(
+            resolved for rel, resolved in tree if any(r.match(rel) for r in regexes)
+        )
+    return found
+
+
 def discover_files(
-    root: Path, includes: Sequence[str], excludes: Sequence[str]
+    root: Path,
+    includes: Sequence[str],
+    excludes: Sequence[str],
+    walk_threads: int = 1,
 ) -> List[Path]:
     include_globs = list(includes) if includes else ["**/*"]
-    matched: set[Path] = set()
+    base = str(root.resolve())
+
+    # One scandir walk per distinct literal directory prefix serves every
+    # include and exclude glob. Path.glob() follows symlinked directories
+    # through plain segments (never "**"), so if a walked subtree has any,
+    # wildcard globbing stays with Path.glob() to keep that.
+    anchors = [
+        glob_anchor(pattern)
+        for pattern in (*include_globs, *excludes)
+        if glob.has_magic(pattern) and compile_glob(pattern) is not None
+    ]
+    prune = compile_prune_glob(excludes)
+    pruned: List[str] = []
+    linked_dirs: List[str] = []
+    tree = walk_anchors(base, anchors, prune, pruned, linked_dirs, walk_threads)
+    use_tree = not linked_dirs
+    matched = match_globs(root, base, include_globs, tree, use_tree)
+    excluded = match_globs(root, base, excludes, tree, use_tree)
+    if use_tree and pruned:
+        # Pruned files never reach `excluded`; anything resolving below a
+        # pruned directory is dropped by prefix instead.
+        pruned_prefixes = tuple(path + os.sep for path in pruned)
+        matched = {p for p in matched if not p.startswith(pruned_prefixes)}
+
+    result = sorted(Path(p) for p in matched if p not in excluded)
+    return result
 
-    for pattern in include_globs:
-        for path in root.glob(pattern):
-            if path.is_file():
-                matched.add(path.resolve())
 
-    excluded: set[Path] = set()
-    for pattern in excludes:
-        for path in root.glob(pattern):
-            if path.is_file():
-                excluded.add(path.resolve())
+def compile_rules(
+    rules: Sequence[Rule], identifier_boundary: bool
+) -> List[CompiledRule]:
+    compiled: List[CompiledRule] = []
+    for group in group_fusable_rules(rules, identifier_boundary):
+        if len(group) == 1:
+            rule, expanded = group[0]
+            literal = rule.find and not rule.regex and not rule.ignore_case
+            if literal and not identifier_boundary:
+                # A bare literal needs no regex features; str.replace and
+                # str.count run as C substring searches.
+                compiled.append((rule.find, expanded))
+                continue
+            pattern = compile_rule(
+                rule, identifier_boundary=identifier_boundary and not rule.regex
+            )
+            compiled.append((pattern, rule.replace))
+            continue
+        # Non-interacting literals share one alternation, so the text is
+        # scanned once for the whole group instead of once per rule.
+        pattern = literal_trie_pattern(rule.find for rule, _ in group)
+        if identifier_boundary:
+            pattern = wrap_identifier_boundary(pattern)
+        lookup = {rule.find: expanded for rule, expanded in group}
+        compiled.append(
+            (
+                re.compile(pattern, flags=re.MULTILINE),
+                lambda match, lookup=lookup: lookup[match.group(0)],
+            )
+        )
+    return compiled
 
-    result = sorted(p for p in matched if p not in excluded)
-    return result
+
+def build_prefilter(rules: Sequence[Rule]) -> re.Pattern[bytes] | None:
+    # Literal, case-sensitive rules can only fire on a file whose raw bytes
+    # contain at least one find (the first rule to fire needs its find in the
+    # original text). Finds with line breaks could straddle a "\r\n" that
+    # decoding folds, so those, like regex and ignore-case rules, disable it.
+    needles: List[str] = []
+    for rule in rules:
+        if rule.regex or rule.ignore_case or not rule.find:
+            return None
+        if "\r" in rule.find or "\n" in rule.find:
+            return None
+        # Latin-1 maps each byte to one char, so the str trie builder can
+        # produce a bytes pattern.
+        needles.append(rule.find.encode("utf-8", "surrogatepass").decode("latin-1"))
+    # One trie scan screens for every find at once, instead of a substring
+    # search per rule. Only presence matters, so a needle that extends a
+    # shorter one is redundant; dropping it keeps the trie prefix-free.
+    screen: List[str] = []
+    for needle in sorted(needles):
+        if not screen or not needle.startswith(screen[-1]):
+            screen.append(needle)
+    return re.compile(literal_trie_pattern(screen).encode("latin-1"))
+
+
+def rules_are_line_local(rules: Sequence[Rule]) -> bool:
+    # A literal without line breaks can neither match across lines nor see
+    # past a line end (the line keeps its "\n"), so applying the rule chain
+    # line by line gives the same text and counts as applying it to the file.
+    # An empty find is excluded: it matches at every line boundary, so each
+    # split point would gain an extra match.
+    return all(
+        rule.find
+        and not rule.regex
+        and "\n" not in rule.find
+        and "\r" not in rule.find
+        for rule in rules
+    )
+
+
+def decode_text(data: bytes) -> str:
+    # Decode like Path.read_text(): UTF-8 with universal newline translation.
+    # Deliberately mirrors decode_source() in color_tokenizer.py; both tools
+    # are standalone scripts, so the helper is kept local rather than shared.
+    text = data.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
 
 
 def apply_rules_to_text(
-    text: str, rules: Sequence[Rule], identifier_boundary: bool
+    text: str, compiled_rules: Sequence[CompiledRule]
 ) -> tuple[str, int]:
     total_replacements = 0
     out = text
-    for rule in rules:
-        pattern = compile_rule(
-            rule, identifier_boundary=identifier_boundary and not rule.regex
-        )
-        out, count = pattern.subn(rule.replace, out)
+    for pattern, replacement in compiled_rules:
+        if isinstance(pattern, str):
+            count = out.count(pattern)
+            if count:
+                out = out.replace(pattern, replacement)
+        else:
+            out, count = pattern.subn(replacement, out)
         total_replacements += count
     return out, total_replacements
 
 
+def write_text_atomic(path: Path, text: str) -> None:
+    # Write a sibling temp file and rename it over the target, so an
+    # interrupted run never leaves a truncated file. Symlinks are resolved
+    # first and the original mode bits are carried over, as an in-place
+    # write_text() would have kept both.
+    target = os.path.realpath(path)
+    data = text.encode("utf-8")
+    if os.linesep != "\n":
+        data = data.replace(b"\n", os.linesep.encode("ascii"))
+    fd, temp_path = make_sibling_temp(target)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        replace_from_temp(temp_path, target)
+    except BaseException:
+        discard_temp(temp_path)
+        raise
+
+
+def make_sibling_temp(target: str) -> Tuple[int, str]:
+    return tempfile.mkstemp(
+        dir=os.path.dirname(target),
+        prefix=f".{os.path.basename(target)}.",
+        suffix=".tmp",
+    )
+
+
+def replace_from_temp(temp_path: str, target: str) -> None:
+    os.chmod(temp_path, os.stat(target).st_mode & 0o7777)
+    os.replace(temp_path, target)
+
+
+def discard_temp(temp_path: str) -> None:
+    try:
+        os.unlink(temp_path)
+    except FileNotFoundError:
+        pass
+
+
+def process_file_streaming(
+    path: Path, compiled_rules: Sequence[CompiledRule], apply: bool
+) -> int:
+    # Same result as process_file() for line-local rules, holding one line
+    # at a time; text mode gives the same newline handling as decode_text()
+    # on read and write_text() on write.
+    count = 0
+    if not apply:
+        try:
+            with open(path, encoding="utf-8", buffering=1 << 20) as source:
+                for line in source:
+                    count += apply_rules_to_text(line, compiled_rules)[1]
+        except UnicodeDecodeError:
+            return 0
+        return count
+
+    target = os.path.realpath(path)
+    fd, temp_path = make_sibling_temp(target)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", buffering=1 << 20) as sink:
+            with open(target, encoding="utf-8", buffering=1 << 20) as source:
+                for line in source:
+                    updated, line_count = apply_rules_to_text(line, compiled_rules)
+                    sink.write(updated)
+                    count += line_count
+        if count:
+            replace_from_temp(temp_path, target)
+        else:
+            discard_temp(temp_path)
+    except UnicodeDecodeError:
+        discard_temp(temp_path)
+        return 0
+    except BaseException:
+        discard_temp(temp_path)
+        raise
+    return count
+
+
+def process_file(
+    path: Path,
+    compiled_rules: Sequence[CompiledRule],
+    prefilter: re.Pattern[bytes] | None,
+    apply: bool,
+    stream: bool,
+) -> int:
+    if stream:
+        return process_file_streaming(path, compiled_rules, apply)
+    raw = path.read_bytes()
+    if prefilter is not None and prefilter.search(raw) is None:
+        # No rule can match; skip the decode and the rule passes.
+        return 0
+    try:
+        original = decode_text(raw)
+    except UnicodeDecodeError:
+        return 0
+
+    updated, count = apply_rules_to_text(original, compiled_rules)
+    if count and apply:
+        write_text_atomic(path, updated)
+    return count
+
+
+def init_worker(
+    rules: Sequence[Rule], identifier_boundary: bool, apply: bool, stream: bool
+) -> None:
+    global WORKER_RULES, WORKER_PREFILTER, WORKER_APPLY, WORKER_STREAM
+    WORKER_RULES = compile_rules(rules, identifier_boundary=identifier_boundary)
+    WORKER_PREFILTER = build_prefilter(rules)
+    WORKER_APPLY = apply
+    WORKER_STREAM = stream
+
+
+def process_file_in_worker(path: Path) -> int:
+    return process_file(
+        path, WORKER_RULES, WORKER_PREFILTER, WORKER_APPLY, WORKER_STREAM
+    )
+
+
+def process_files(
+    files: Sequence[Path],
+    rules: Sequence[Rule],
+    compiled_rules: Sequence[CompiledRule],
+    identifier_boundary: bool,
+    apply: bool,
+    stream: bool,
+    jobs: int,
+) -> List[int]:
+    if jobs <= 1 or len(files) < PARALLEL_MIN_FILES:
+        prefilter = build_prefilter(rules)
+        return [
+            process_file(path, compiled_rules, prefilter, apply, stream)
+            for path in files
+        ]
+    # A prefiltered file costs about as much as one task round trip, so send
+    # large batches; four per worker still lets idle workers pick up the
+    # tail when a few files need real rewrites.
+    chunksize = max(1, len(files) // (jobs * 4))
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=init_worker,
+        initargs=(rules, identifier_boundary, apply, stream),
+    ) as executor:
+        return list(executor.map(process_file_in_worker, files, chunksize=chunksize))
+
+
 def main() -> int:
     args = parse_args()
 
@@ -194,28 +809,41 @@ def main() -> int:
         print(f"error: root path does not exist: {root}", file=sys.stderr)
         return 1
 
-    files = discover_files(root=root, includes=args.include, excludes=args.exclude)
+    if args.stream and not rules_are_line_local(rules):
+        print(
+            "error: --stream needs non-empty literal rules without line breaks",
+            file=sys.stderr,
+        )
+        return 1
+
+    # Rules are compiled once for the run, not once per scanned file; pool
+    # workers rebuild them in init_worker.
+    compiled_rules = compile_rules(rules, identifier_boundary=args.identifier_boundary)
+    files = discover_files(
+        root=root,
+        includes=args.include,
+        excludes=args.exclude,
+        walk_threads=args.walk_threads,
+    )
     changed_files = 0
     total_replacements = 0
 
-    for path in files:
-        try:
-            original = path.read_text(encoding="utf-8")
-        except UnicodeDecodeError:
-            continue
-
-        updated, count = apply_rules_to_text(
-            original, rules=rules, identifier_boundary=args.identifier_boundary
-        )
+    counts = process_files(
+        files,
+        rules=rules,
+        compiled_rules=compiled_rules,
+        identifier_boundary=args.identifier_boundary,
+        apply=args.apply,
+        stream=args.stream,
+        jobs=args.jobs,
+    )
+    for path, count in zip(files, counts):
         if count == 0:
             continue
 
         changed_files += 1
         total_replacements += count
 
-        if args.apply:
-            path.write_text(updated, encoding="utf-8")
-
         if args.verbose:
             rel = path.relative_to(REPO_ROOT).as_posix()
             print(f"{rel}: replacements={count}")
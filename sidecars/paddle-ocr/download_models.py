@@ -4,12 +4,17 @@
 from __future__ import annotations
 
 import argparse
+import os
 import shutil
 import tarfile
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Iterable
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 ARCHIVE_BASE_URLS = (
     "https://paddle-model-ecology.bj.bcebos.com/paddlex/official_inference_model/paddle3.0.0",
@@ -43,6 +48,30 @@ REQUEST_HEADERS = {
     "User-Agent": "squigit-ocr-model-bootstrap/1.0",
 }
 
+DOWNLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    session.headers.update(REQUEST_HEADERS)
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# One session for every model keeps connections alive across downloads, so each
+# mirror host pays for a single TLS handshake instead of one per file.
+SESSION = _build_session()
+
 
 def _model_dir_name(archive_name: str) -> str:
     return archive_name.removesuffix("_infer.tar")
@@ -57,14 +86,23 @@ def _allowlisted_model_dirs() -> set[str]:
     return allowed
 
 
-def _has_model_graph(model_dir: Path) -> bool:
-    return (model_dir / "inference.pdmodel").exists() or (
-        model_dir / "inference.json"
-    ).exists()
+def _model_file_names(model_dir: Path) -> set[str]:
+    try:
+        with os.scandir(model_dir) as entries:
+            return {entry.name for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
+
+def _has_model_graph(names: set[str]) -> bool:
+    return "inference.pdmodel" in names or "inference.json" in names
 
 
 def _is_model_ready(model_dir: Path) -> bool:
-    return _has_model_graph(model_dir) and (model_dir / "inference.pdiparams").exists()
+    # One directory read answers every file check instead of a stat per file,
+    # which adds up on network-mounted checkouts.
+    names = _model_file_names(model_dir)
+    return _has_model_graph(names) and "inference.pdiparams" in names
 
 
 def _archive_urls(archive_name: str) -> Iterable[str]:
@@ -90,18 +128,16 @@ def _normalize_model_dir(model_name: str) -> Path:
 
 def download_file(url: str, output_path: Path) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with requests.get(
+    with SESSION.get(
         url,
         stream=True,
         timeout=(20, 180),
-        headers=REQUEST_HEADERS,
         allow_redirects=True,
     ) as response:
         response.raise_for_status()
+        response.raw.decode_content = True
         with output_path.open("wb") as file:
-            for chunk in response.iter_content(chunk_size=1024 * 1024):
-                if chunk:
-                    file.write(chunk)
+            shutil.copyfileobj(response.raw, file, DOWNLOAD_CHUNK_SIZE)
 
 
 def _download_from_hf(model_name: str, model_dir: Path) -> None:
@@ -141,12 +177,38 @@ def _download_from_hf(model_name: str, model_dir: Path) -> None:
     )
 
 
-def extract_archive(archive_path: Path, destination: Path) -> None:
-    with tarfile.open(archive_path, "r") as archive:
-        try:
-            archive.extractall(path=destination, filter="data")
-        except TypeError:
-            archive.extractall(path=destination)
+def extract_remote_archive(url: str, destination: Path) -> None:
+    destination.mkdir(parents=True, exist_ok=True)
+    # Extract into a private staging directory and move the result into place
+    # only once the whole archive is in, so an interrupted or failed download
+    # never leaves a half-written model directory that looks ready.
+    staging = Path(tempfile.mkdtemp(prefix=".extract-", dir=destination))
+    try:
+        with SESSION.get(
+            url,
+            stream=True,
+            timeout=(20, 180),
+            allow_redirects=True,
+        ) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            # Stream mode reads members in order straight off the socket, so
+            # the archive never lands on disk before extraction.
+            with tarfile.open(fileobj=response.raw, mode="r|*") as archive:
+                try:
+                    archive.extractall(path=staging, filter="data")
+                except TypeError:
+                    archive.extractall(path=staging)
+
+        for entry in staging.iterdir():
+            target = destination / entry.name
+            if target.is_dir() and not target.is_symlink():
+                shutil.rmtree(target)
+            elif target.exists() or target.is_symlink():
+                target.unlink()
+            entry.rename(target)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
 
 
 def ensure_model(archive_name: str) -> None:
@@ -161,20 +223,12 @@ def ensure_model(archive_name: str) -> None:
         if stale_dir.exists():
             shutil.rmtree(stale_dir)
 
-    MODELS_DIR.mkdir(parents=True, exist_ok=True)
-    archive_path = MODELS_DIR / archive_name
     archive_errors = []
 
     for url in _archive_urls(archive_name):
         try:
-            print(f"Downloading {archive_name} from {url}...")
-            download_file(url, archive_path)
-
-            print(f"Extracting {archive_name}...")
-            extract_archive(archive_path, MODELS_DIR)
-
-            if archive_path.exists():
-                archive_path.unlink()
+            print(f"Downloading and extracting {archive_name} from {url}...")
+            extract_remote_archive(url, MODELS_DIR)
 
             model_dir = _normalize_model_dir(model_name)
             if _is_model_ready(model_dir):
@@ -184,9 +238,6 @@ def ensure_model(archive_name: str) -> None:
             )
         except Exception as exc:
             archive_errors.append(f"{url}: {exc}")
-        finally:
-            if archive_path.exists():
-                archive_path.unlink()
 
     print(
         f"Archive mirrors failed for {archive_name}; trying direct Hugging Face files..."
@@ -231,8 +282,10 @@ def main() -> None:
     print("Preparing bundled PP-OCRv5 models...")
     if args.clean_stale:
         prune_stale_model_dirs()
-    for archive_name in MODELS:
-        ensure_model(archive_name)
+    # Each model downloads and extracts into its own directory, so the
+    # network-bound fetches can overlap.
+    with ThreadPoolExecutor(max_workers=len(MODELS)) as executor:
+        list(executor.map(ensure_model, MODELS))
     print("All bundled models are ready.")
 
 
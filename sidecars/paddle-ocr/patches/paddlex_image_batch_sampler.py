@@ -12,6 +12,7 @@ This patch defers PDF reader creation until a PDF input is actually processed.
 from __future__ import annotations
 
 import pathlib
+import re
 import sys
 
 SCRIPT_DIR = pathlib.Path(__file__).parent.parent.absolute()
@@ -51,9 +52,6 @@ if not target.exists():
 
 content = target.read_text(encoding="utf-8")
 marker = "# Patched: lazily initialize PDFReader for image-only OCR startup"
-if marker in content:
-    print("- Already patched.")
-    raise SystemExit(0)
 
 init_old = """    def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -84,15 +82,32 @@ pdf_new = """                    file_path = (
                     doc = self.pdf_reader.load(file_path)
 """
 
-if init_old not in content:
+# Locate the marker and both blocks in one scan instead of a containment
+# check plus a replace pass per block.
+replacements = {init_old: init_new, pdf_old: pdf_new}
+anchors = re.compile("|".join(re.escape(text) for text in (marker, *replacements)))
+matches = list(anchors.finditer(content))
+found = {match.group(0) for match in matches}
+
+if marker in found:
+    print("- Already patched.")
+    raise SystemExit(0)
+
+if init_old not in found:
     print("[ERROR] __init__ block not found; PaddleX layout changed.")
     raise SystemExit(1)
 
-if pdf_old not in content:
+if pdf_old not in found:
     print("[ERROR] PDF sampling block not found; PaddleX layout changed.")
     raise SystemExit(1)
 
-content = content.replace(init_old, init_new)
-content = content.replace(pdf_old, pdf_new)
+parts = []
+last_end = 0
+for match in matches:
+    parts.append(content[last_end : match.start()])
+    parts.append(replacements[match.group(0)])
+    last_end = match.end()
+parts.append(content[last_end:])
+content = "".join(parts)
 target.write_text(content, encoding="utf-8")
 print("[OK] Patch applied.")
@@ -15,7 +15,7 @@ import numpy as np
 if __name__ == "__main__":
     sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from src import EngineConfig, OCREngine  # noqa: E402
+from src import EngineConfig, OCREngine, OCRResultBatch  # noqa: E402
 
 
 def main() -> int:
@@ -63,8 +63,8 @@ def main() -> int:
         except OSError:
             pass
 
-    if not isinstance(results, list):
-        print("OCR runtime smoke failed: result is not a list")
+    if not isinstance(results, OCRResultBatch):
+        print("OCR runtime smoke failed: result is not an OCRResultBatch")
         return 1
 
     print(f"OCR runtime smoke passed (detections={len(results)})")
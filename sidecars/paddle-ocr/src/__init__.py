@@ -22,12 +22,13 @@ text and bounding boxes from images.
 
 from .engine import OCREngine
 from .config import EngineConfig
-from .models import OCRResult, BoundingBox, NumpyEncoder
+from .models import OCRResult, OCRResultBatch, BoundingBox, NumpyEncoder
 
 __all__ = [
     "OCREngine",
     "EngineConfig",
     "OCRResult",
+    "OCRResultBatch",
     "BoundingBox",
     "NumpyEncoder",
 ]
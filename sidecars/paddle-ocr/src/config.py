@@ -14,10 +14,12 @@ including model paths and processing settings.
 import os
 import sys
 from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Optional
 
 
+@lru_cache(maxsize=1)
 def _get_base_dir() -> Path:
     """
     Determine the base directory for model files.
@@ -51,7 +53,9 @@ class EngineConfig:
 
     lang: str = "en"
 
-    use_angle_cls: bool = True
+    # Textline orientation is rarely needed for upright screenshots and
+    # costs an extra model pass per detected line.
+    use_angle_cls: bool = False
 
     base_dir: Optional[Path] = None
 
@@ -60,12 +64,41 @@ class EngineConfig:
     rec_model_path: Optional[str] = None
     cls_model_path: Optional[str] = None
 
+    # oneDNN (MKLDNN) fused CPU kernels; opt-in until validated per platform.
+    enable_mkldnn: bool = False
+    mkldnn_cache_capacity: int = 10
+    # Inference threads when oneDNN is on; None uses half the CPU count.
+    cpu_threads: Optional[int] = None
+
+    # Recognition/orientation batch sizes. CPU inference runs batch items
+    # sequentially anyway, while larger batches grow the native memory
+    # arena; raise these only when a GPU is in play.
+    rec_batch_size: int = 1
+    cls_batch_size: int = 1
+
+    # "int8" prefers quantized "<model>_int8" directories next to the bundled
+    # FP32 ones (pair with enable_mkldnn for int8 kernels); FP32 otherwise.
+    precision: str = "fp32"
+
     def __post_init__(self):
         """Initialize computed paths after dataclass init."""
         if self.base_dir is None:
             self.base_dir = _get_base_dir()
 
     @property
+    def inference_threads(self) -> int:
+        """
+        Get the CPU thread count for oneDNN inference.
+
+        @return Configured thread count, or half the CPU count.
+        """
+        if self.cpu_threads:
+            return self.cpu_threads
+        return max(1, (os.cpu_count() or 1) // 2)
+
+    # The directory properties below are resolved on first access and then
+    # cached; set base_dir and the *_model_path overrides at construction.
+    @cached_property
     def model_dir(self) -> Path:
         """
         Get the models directory path.
@@ -74,7 +107,20 @@ class EngineConfig:
         """
         return self.base_dir / "models"
 
-    @property
+    def _bundled_model_dir(self, model_name: str) -> str:
+        """
+        Resolve a bundled model directory for the configured precision.
+
+        @param model_name Official model name of the FP32 directory.
+        @return Quantized directory if requested and present, else FP32.
+        """
+        if self.precision == "int8":
+            quantized = self.model_dir / f"{model_name}_int8"
+            if quantized.is_dir():
+                return str(quantized)
+        return str(self.model_dir / model_name)
+
+    @cached_property
     def det_model_dir(self) -> str:
         """
         Get the detection model directory path.
@@ -82,9 +128,9 @@ class EngineConfig:
         """
         if self.det_model_path:
             return self.det_model_path
-        return str(self.model_dir / "PP-OCRv5_mobile_det")
+        return self._bundled_model_dir("PP-OCRv5_mobile_det")
 
-    @property
+    @cached_property
     def rec_model_dir(self) -> str:
         """
         Get the recognition model directory path.
@@ -92,9 +138,9 @@ class EngineConfig:
         """
         if self.rec_model_path:
             return self.rec_model_path
-        return str(self.model_dir / "en_PP-OCRv5_mobile_rec")
+        return self._bundled_model_dir("en_PP-OCRv5_mobile_rec")
 
-    @property
+    @cached_property
     def cls_model_dir(self) -> str:
         """
         Get the classification model directory path.
@@ -4,19 +4,38 @@
 
 import argparse
 import contextlib
-import json
+import dataclasses
 import os
 import sys
 import traceback
 import warnings
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
-os.environ["OMP_NUM_THREADS"] = "1"
-os.environ["OPENBLAS_NUM_THREADS"] = "1"
-os.environ["MKL_NUM_THREADS"] = "1"
-os.environ["NUMEXPR_NUM_THREADS"] = "1"
+import orjson
+
+
+def _math_library_threads() -> str:
+    # One thread by default: the desktop app runs one OCR job at a time next
+    # to everything else on the machine. SQUIGIT_OCR_THREADS lets a dedicated
+    # or long-lived (--serve) sidecar use more cores.
+    value = os.environ.get("SQUIGIT_OCR_THREADS", "").strip()
+    if value.isdigit() and int(value) > 0:
+        return str(int(value))
+    return "1"
+
+
+_MATH_THREADS = _math_library_threads()
+os.environ["OMP_NUM_THREADS"] = _MATH_THREADS
+os.environ["OPENBLAS_NUM_THREADS"] = _MATH_THREADS
+os.environ["MKL_NUM_THREADS"] = _MATH_THREADS
+os.environ["NUMEXPR_NUM_THREADS"] = _MATH_THREADS
 os.environ["OMP_WAIT_POLICY"] = "PASSIVE"
+if _MATH_THREADS != "1":
+    # Keep the OpenMP pool on neighbouring cores instead of migrating.
+    os.environ.setdefault("OMP_PROC_BIND", "close")
+    os.environ.setdefault("OMP_PLACES", "cores")
 
 # Keep sidecar stderr focused on actionable OCR failures.
 warnings.filterwarnings(
@@ -156,7 +175,7 @@ _preload_frozen_paddle_libs()
 if __name__ == "__main__":
     sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src import EngineConfig, NumpyEncoder, OCREngine, __version__
+from src import EngineConfig, OCREngine, __version__
 
 
 def _format_exception(exc: Exception) -> str:
@@ -170,10 +189,25 @@ def _format_exception(exc: Exception) -> str:
     return str(exc)
 
 
-def _emit_json(payload: Any) -> None:
+def _write_stdout(data: bytes) -> None:
+    # orjson produces UTF-8 bytes; write them below the text layer.
     stream = sys.__stdout__
-    stream.write(json.dumps(payload, cls=NumpyEncoder))
     stream.flush()
+    stream.buffer.write(data)
+    stream.buffer.flush()
+
+
+def _emit_json(payload: Any) -> None:
+    _write_stdout(orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY))
+
+
+def _emit_json_line(payload: Any) -> None:
+    _write_stdout(
+        orjson.dumps(
+            payload,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE,
+        )
+    )
 
 
 def _emit_error(message: str) -> int:
@@ -188,26 +222,198 @@ def _create_config(args: argparse.Namespace) -> EngineConfig:
         det_model_path=args.det_model_dir,
         rec_model_path=args.rec_model_dir,
         cls_model_path=args.cls_model_dir,
+        enable_mkldnn=args.enable_mkldnn,
+        cpu_threads=args.cpu_threads,
+        precision=args.precision,
+        rec_batch_size=args.rec_batch_size,
     )
 
 
 def process_path(image_path: str, args: argparse.Namespace) -> int:
-    if not Path(image_path).exists():
-        return _emit_error(f"Image not found: {image_path}")
+    return process_paths([image_path], args)
+
+
+# Image path argument that reads the encoded image bytes from stdin instead.
+STDIN_IMAGE_PATH = "-"
+
+
+def process_stdin_image(args: argparse.Namespace) -> int:
+    try:
+        data = sys.stdin.buffer.read()
+        config = _create_config(args)
+        with contextlib.redirect_stdout(sys.stderr):
+            engine = OCREngine(config)
+            results = engine.process_bytes(data)
+        _emit_json(results.to_dict())
+        return 0
+    except Exception as exc:
+        return _emit_error(_format_exception(exc))
+
+
+def process_paths(image_paths: list[str], args: argparse.Namespace) -> int:
+    if image_paths == [STDIN_IMAGE_PATH]:
+        return process_stdin_image(args)
+
+    for image_path in image_paths:
+        if not Path(image_path).exists():
+            return _emit_error(f"Image not found: {image_path}")
 
     try:
         config = _create_config(args)
         # Route noisy Python-level prints from third-party code away from stdout.
         with contextlib.redirect_stdout(sys.stderr):
             engine = OCREngine(config)
-            results = engine.process(image_path)
-        output = [result.to_dict() for result in results]
-        _emit_json(output)
+            pages = engine.process_batch(image_paths)
+        output = [results.to_dict() for results in pages]
+        # A single image keeps the flat result list callers already parse.
+        _emit_json(output[0] if len(output) == 1 else output)
         return 0
     except Exception as exc:
         return _emit_error(_format_exception(exc))
 
 
+# Loaded engines kept by --serve; each holds its own models and native arena.
+SERVE_MAX_ENGINES = 2
+
+# Per-request overrides accepted by --serve, mapped to EngineConfig fields.
+# Only fields the engine actually reads belong here; anything else would
+# load a duplicate model set under a new cache key.
+SERVE_CONFIG_FIELDS = {
+    "det_model_dir": "det_model_path",
+    "rec_model_dir": "rec_model_path",
+    "cls_model_dir": "cls_model_path",
+}
+
+
+def _parse_serve_request(line: bytes) -> dict[str, Any]:
+    text = line.decode("utf-8").strip()
+    if not text.startswith("{"):
+        return {"image_path": text}
+
+    request = orjson.loads(text)
+    if not isinstance(request, dict):
+        raise ValueError("Request must be a JSON object")
+    return request
+
+
+def _payload_size(request: dict[str, Any]) -> int | None:
+    size = request.get("len")
+    if size is None:
+        return None
+    if not isinstance(size, int) or isinstance(size, bool) or size < 0:
+        raise ValueError("len must be a non-negative integer")
+    return size
+
+
+def _serve_overrides(request: dict[str, Any]) -> dict[str, str]:
+    if ("image_path" in request) == ("len" in request):
+        raise ValueError("Request needs exactly one of image_path or len")
+    if "image_path" in request and not isinstance(request["image_path"], str):
+        raise ValueError("image_path must be a string")
+
+    overrides = {}
+    for key, value in request.items():
+        if key in ("image_path", "len") or value is None:
+            continue
+        if key not in SERVE_CONFIG_FIELDS:
+            raise ValueError(f"Unsupported request field: {key}")
+        overrides[SERVE_CONFIG_FIELDS[key]] = str(value)
+    return overrides
+
+
+# Bytes per read when draining a --serve image payload from stdin.
+STDIN_CHUNK_SIZE = 64 * 1024
+
+
+def _read_payload(stream: Any, size: int) -> bytearray:
+    # Fill one preallocated buffer in bounded chunks instead of one
+    # read(size), which buffers and concatenates internally and is slow on
+    # Windows pipes; a short result means stdin hit EOF.
+    payload = bytearray(size)
+    filled = 0
+    with memoryview(payload) as view:
+        while filled < size:
+            count = stream.readinto(view[filled : filled + STDIN_CHUNK_SIZE])
+            if not count:
+                break
+            filled += count
+    del payload[filled:]
+    return payload
+
+
+def serve(args: argparse.Namespace) -> int:
+    """
+    Answer image requests from stdin, one JSON line each.
+
+    Each request line is either an image path or a JSON object with an
+    image_path and optional det_model_dir/rec_model_dir/cls_model_dir
+    overrides. Instead of image_path, an object may carry "len": N, in
+    which case exactly N bytes of the encoded image follow the line.
+    Up to SERVE_MAX_ENGINES engines stay loaded, one per recently used set
+    of overrides, so repeated configurations skip initialization.
+    """
+    try:
+        base_config = _create_config(args)
+        with contextlib.redirect_stdout(sys.stderr):
+            engine = OCREngine(base_config)
+            engine.warmup()
+    except Exception as exc:
+        _emit_json_line({"error": _format_exception(exc)})
+        return 1
+
+    stdin = sys.stdin.buffer
+    # Least recently used first; bounded so alternating configs cannot grow
+    # resident memory by one model set each.
+    engines: OrderedDict[tuple[tuple[str, str], ...], OCREngine] = OrderedDict()
+    engines[()] = engine
+    for line in stdin:
+        if not line.strip():
+            continue
+        try:
+            request = _parse_serve_request(line)
+            size = _payload_size(request)
+        except ValueError as exc:
+            _emit_json_line({"error": f"Invalid request: {exc}"})
+            continue
+
+        data = None
+        if size is not None:
+            # Consume the payload before validating the rest of the request
+            # so the stream stays framed even when the request is rejected.
+            data = _read_payload(stdin, size)
+            if len(data) != size:
+                _emit_json_line({"error": "Invalid request: truncated image data"})
+                return 1
+
+        try:
+            overrides = _serve_overrides(request)
+        except ValueError as exc:
+            _emit_json_line({"error": f"Invalid request: {exc}"})
+            continue
+        # A missing file surfaces as the engine's "Image not found" error
+        # when it opens the path, without a separate stat here.
+        image_path = request.get("image_path")
+        try:
+            with contextlib.redirect_stdout(sys.stderr):
+                key = tuple(sorted(overrides.items()))
+                engine = engines.get(key)
+                if engine is None:
+                    engine = OCREngine(dataclasses.replace(base_config, **overrides))
+                    engines[key] = engine
+                    if len(engines) > SERVE_MAX_ENGINES:
+                        engines.popitem(last=False)
+                else:
+                    engines.move_to_end(key)
+                if data is None:
+                    results = engine.process(image_path)
+                else:
+                    results = engine.process_bytes(data)
+            _emit_json_line(results.to_dict())
+        except Exception as exc:
+            _emit_json_line({"error": _format_exception(exc)})
+    return 0
+
+
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Squigit PaddleOCR sidecar (CLI mode)."
@@ -215,7 +421,18 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--version", action="version", version=__version__
     )
-    parser.add_argument("image_path", help="Path to image file.")
+    parser.add_argument(
+        "image_paths",
+        nargs="*",
+        metavar="image_path",
+        help="Path to image file, or - to read one from stdin. Several paths are "
+        "processed as one batch.",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Read image requests from stdin, one per line; answer each in JSON.",
+    )
     parser.add_argument("--lang", default="en", help="Language hint (default: en).")
     parser.add_argument(
         "--det-model-dir", default=None, help="Detection model directory."
@@ -226,12 +443,35 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--cls-model-dir", default=None, help="Textline orientation model directory."
     )
+    parser.add_argument(
+        "--enable-mkldnn",
+        action="store_true",
+        help="Use oneDNN (MKLDNN) CPU kernels for inference.",
+    )
+    parser.add_argument(
+        "--cpu-threads",
+        type=int,
+        default=None,
+        help="Inference threads with --enable-mkldnn (default: half the CPU count).",
+    )
+    parser.add_argument(
+        "--precision",
+        choices=("fp32", "int8"),
+        default="fp32",
+        help="Prefer quantized <model>_int8 bundled models when set to int8.",
+    )
+    parser.add_argument(
+        "--rec-batch-size",
+        type=int,
+        default=1,
+        help="Text crops per recognizer call (default: 1; raise on GPU builds).",
+    )
     parser.add_argument(
         "--use-angle-cls",
         dest="use_angle_cls",
         action="store_true",
-        default=True,
-        help="Enable textline orientation model.",
+        default=False,
+        help="Enable textline orientation model (off by default).",
     )
     parser.add_argument(
         "--no-angle-cls",
@@ -243,8 +483,19 @@ def _build_parser() -> argparse.ArgumentParser:
 
 
 def main() -> int:
-    args = _build_parser().parse_args()
-    return process_path(args.image_path, args)
+    parser = _build_parser()
+    args = parser.parse_args()
+    if args.cpu_threads is not None and args.cpu_threads < 1:
+        parser.error("--cpu-threads must be at least 1")
+    if args.rec_batch_size < 1:
+        parser.error("--rec-batch-size must be at least 1")
+    if args.serve:
+        if args.image_paths:
+            parser.error("--serve reads image paths from stdin; do not pass any")
+        return serve(args)
+    if not args.image_paths:
+        parser.error("the following arguments are required: image_path")
+    return process_paths(args.image_paths, args)
 
 
 if __name__ == "__main__":
@@ -13,7 +13,8 @@ OCR results including bounding boxes and text detections.
 
 import json
 from dataclasses import dataclass, field
-from typing import List, Tuple
+from collections.abc import Sequence
+from typing import Iterator, List, Tuple, Union, overload
 import numpy as np
 
 
@@ -41,7 +42,7 @@ class NumpyEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
-@dataclass
+@dataclass(slots=True)
 class BoundingBox:
     """
     Represents a quadrilateral bounding box around detected text.
@@ -106,7 +107,7 @@ class BoundingBox:
         return abs(self.bottom_left[1] - self.top_left[1])
 
 
-@dataclass
+@dataclass(slots=True)
 class OCRResult:
     """
     Represents a single OCR detection result.
@@ -145,3 +146,113 @@ class OCRResult:
         @return JSON string representation.
         """
         return json.dumps(self.to_dict(), cls=NumpyEncoder)
+
+
+@dataclass(slots=True)
+class OCRResultBatch(Sequence):
+    """
+    Represents all OCR detections of one image in columnar form.
+
+    Texts, confidences and boxes are stored as parallel columns, so a
+    page costs a few arrays instead of one object pair per line.
+    The batch is a read-only Sequence: iterating or indexing yields
+    OCRResult objects built on demand, and slicing returns a smaller batch.
+
+    @example
+        batch = engine.process("image.png")
+        payload = batch.to_dict()
+        first = batch[0]
+    """
+
+    texts: List[str] = field(default_factory=list)
+    confidences: np.ndarray = field(
+        default_factory=lambda: np.zeros(0, dtype=np.float64)
+    )
+    boxes: np.ndarray = field(
+        default_factory=lambda: np.zeros((0, 4, 2), dtype=np.float64)
+    )
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __eq__(self, other: object) -> bool:
+        # The generated __eq__ would compare the arrays inside a tuple, which
+        # raises for any page with more than one line.
+        if not isinstance(other, OCRResultBatch):
+            return NotImplemented
+        return (
+            self.texts == other.texts
+            and np.array_equal(self.confidences, other.confidences)
+            and np.array_equal(self.boxes, other.boxes)
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> OCRResult: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "OCRResultBatch": ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[OCRResult, "OCRResultBatch"]:
+        if isinstance(index, slice):
+            return OCRResultBatch(
+                texts=self.texts[index],
+                confidences=self.confidences[index],
+                boxes=self.boxes[index],
+            )
+        top_left, top_right, bottom_right, bottom_left = self.boxes[index].tolist()
+        return OCRResult(
+            text=self.texts[index],
+            box=BoundingBox(
+                top_left=top_left,
+                top_right=top_right,
+                bottom_right=bottom_right,
+                bottom_left=bottom_left,
+            ),
+            confidence=float(self.confidences[index]),
+        )
+
+    def __iter__(self) -> Iterator[OCRResult]:
+        for index in range(len(self.texts)):
+            yield self[index]
+
+    @property
+    def centers(self) -> np.ndarray:
+        """
+        Calculate the center points of all bounding boxes.
+
+        @return Array of shape (N, 2) with (x, y) center coordinates.
+        """
+        return (self.boxes[:, 0] + self.boxes[:, 2]) / 2
+
+    @property
+    def widths(self) -> np.ndarray:
+        """
+        Calculate the widths of all bounding boxes.
+
+        @return Array of shape (N,) with widths in pixels.
+        """
+        return np.abs(self.boxes[:, 1, 0] - self.boxes[:, 0, 0])
+
+    @property
+    def heights(self) -> np.ndarray:
+        """
+        Calculate the heights of all bounding boxes.
+
+        @return Array of shape (N,) with heights in pixels.
+        """
+        return np.abs(self.boxes[:, 3, 1] - self.boxes[:, 0, 1])
+
+    def to_dict(self) -> List[dict]:
+        """
+        Convert all results to dictionaries for JSON serialization.
+
+        @return List of dictionaries with text, box, and confidence fields.
+        """
+        return [
+            {"text": text, "box": box, "confidence": confidence}
+            for text, box, confidence in zip(
+                self.texts, self.boxes.tolist(), self.confidences.tolist()
+            )
+        ]
@@ -5,7 +5,6 @@ from __future__ import annotations
 
 import argparse
 import shutil
-import tempfile
 import urllib.error
 import urllib.request
 from pathlib import Path
@@ -53,8 +52,11 @@ def clean_stale(selected_models: set[str]) -> None:
     if not MODELS_DIR.exists():
         return
 
+    keep = selected_models | {
+        partial_path(MODELS_DIR / name).name for name in selected_models
+    }
     for path in MODELS_DIR.iterdir():
-        if path.name in selected_models:
+        if path.name in keep:
             continue
         print(f"Removing stale entry: {path.name}")
         if path.is_dir():
@@ -70,30 +72,61 @@ def validate_model(path: Path) -> None:
         raise RuntimeError(f"Model file is empty: {path}")
 
 
-def download_to_file(url: str, destination: Path) -> None:
-    temp_path: Path | None = None
-    request = urllib.request.Request(url, headers=REQUEST_HEADERS)
+def partial_path(destination: Path) -> Path:
+    return destination.with_name(f".{destination.name}.part")
+
+
+class HeadRedirectHandler(urllib.request.HTTPRedirectHandler):
+    # urllib rebuilds redirected requests without their method, which would
+    # turn a HEAD probe of a /resolve/ URL into a GET of the whole file.
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        redirected = super().redirect_request(req, fp, code, msg, headers, newurl)
+        if redirected is not None and req.get_method() == "HEAD":
+            redirected.method = "HEAD"
+        return redirected
+
+
+HEAD_OPENER = urllib.request.build_opener(HeadRedirectHandler())
+
+
+def remote_size(url: str) -> int | None:
+    request = urllib.request.Request(url, headers=REQUEST_HEADERS, method="HEAD")
     try:
+        with HEAD_OPENER.open(request, timeout=30) as response:
+            length = response.headers.get("Content-Length", "")
+    except (urllib.error.URLError, TimeoutError, OSError):
+        return None
+    return int(length) if length.isdigit() else None
+
+
+def download_to_file(url: str, destination: Path, expected_size: int | None) -> None:
+    # Bytes land in a stable .part file that survives failures, so a rerun
+    # after an interrupted download resumes with a Range request.
+    partial = partial_path(destination)
+    have = partial.stat().st_size if partial.exists() else 0
+    if expected_size is None or have > expected_size:
+        have = 0
+
+    if expected_size is None or have < expected_size:
+        headers = dict(REQUEST_HEADERS)
+        if have:
+            headers["Range"] = f"bytes={have}-"
+        request = urllib.request.Request(url, headers=headers)
         with urllib.request.urlopen(request, timeout=180) as response:
-            with tempfile.NamedTemporaryFile(
-                dir=destination.parent,
-                delete=False,
-                prefix=f".{destination.name}.",
-                suffix=".tmp",
-            ) as temp_file:
-                temp_path = Path(temp_file.name)
+            mode = "ab" if have and response.status == 206 else "wb"
+            with partial.open(mode) as temp_file:
                 while True:
                     chunk = response.read(CHUNK_SIZE)
                     if not chunk:
                         break
                     temp_file.write(chunk)
 
-        if temp_path is None:
-            raise RuntimeError(f"Temporary file was not created for {destination.name}")
-        temp_path.replace(destination)
-    finally:
-        if temp_path is not None and temp_path.exists():
-            temp_path.unlink(missing_ok=True)
+    if expected_size is not None and partial.stat().st_size != expected_size:
+        raise RuntimeError(
+            f"Incomplete download for {destination.name}: "
+            f"{partial.stat().st_size} of {expected_size} bytes"
+        )
+    partial.replace(destination)
 
 
 def ensure_model(model_name: str) -> None:
@@ -103,8 +136,16 @@ def ensure_model(model_name: str) -> None:
 
     for url in urls:
         try:
+            expected_size = remote_size(url)
+            if (
+                expected_size is not None
+                and destination.exists()
+                and destination.stat().st_size == expected_size
+            ):
+                print(f"Model already present: {model_name}")
+                return
             print(f"Downloading {model_name} from {url}")
-            download_to_file(url, destination)
+            download_to_file(url, destination, expected_size)
             validate_model(destination)
             return
         except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError, OSError) as exc: